@@ -3,105 +3,64 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
+from bolt_mesh import build_mesh, mesh_tables, sample_nodes
+
+def _format_rows(rows, fmt, delimiter=" "):
+    buffer = io.StringIO()
+    np.savetxt(buffer, rows, fmt=fmt, delimiter=delimiter)
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=8)
 def generate_bolt_input(head_diameter, head_thickness, shank_diameter, shank_length, element_size):
-    output = io.StringIO()
-    output.write("** Abaqus Input File for 3D Bolt Model\n")
-    output.write("*Heading\n")
-    output.write("3D Bolt Model\n\n")
-    output.write("*Part, name=Bolt\n")
-    output.write("*Node\n")
-    
-    head_radius = head_diameter / 2
-    shank_radius = shank_diameter / 2
-    
-    num_circumferential = max(8, int((np.pi * max(head_diameter, shank_diameter)) / element_size))
-    num_head_layers = max(1, int(head_thickness / element_size))
-    num_shank_layers = max(1, int(shank_length / element_size))
-    
-    node_id = 1
-    nodes = {}
-    node_coords = []
+    tables = mesh_tables(head_diameter, head_thickness, shank_diameter, shank_length, element_size)
 
-    # Bolt head generation
-    for layer in range(num_head_layers + 1):
-        z = head_thickness - (layer / num_head_layers) * head_thickness
-        for i in range(num_circumferential + 1):
-            theta = (i / num_circumferential) * 2 * np.pi
-            for r in range(int(head_radius / element_size) + 1):
-                radius = min(r * element_size, head_radius)
-                x = radius * np.cos(theta)
-                y = radius * np.sin(theta)
-                output.write(f"{node_id}, {x:.3f}, {y:.3f}, {z:.3f}\n")
-                nodes[(layer, i, r)] = node_id
-                node_coords.append((x, y, z))
-                node_id += 1
+    # The mesh is built and written in float64: float32 values near a .xxx5
+    # boundary can round the other way under %.3f
+    coords, connectivity = build_mesh(*tables)
 
-    # Corrected shank generation
-    for length_layer in range(num_shank_layers + 1):
-        z = head_thickness - (length_layer * (shank_length / num_shank_layers))
-        for i in range(num_circumferential + 1):
-            theta = (i / num_circumferential) * 2 * np.pi
-            for r in range(int(shank_radius / element_size) + 1):
-                radius = min(r * element_size, shank_radius)
-                x = radius * np.cos(theta)
-                y = radius * np.sin(theta)
-                output.write(f"{node_id}, {x:.3f}, {y:.3f}, {z:.3f}\n")
-                nodes[('shank', length_layer, i, r)] = node_id
-                node_coords.append((x, y, z))
-                node_id += 1
+    chunks = []
+    chunks.append("** Abaqus Input File for 3D Bolt Model\n")
+    chunks.append("*Heading\n")
+    chunks.append("3D Bolt Model\n\n")
+    chunks.append("*Part, name=Bolt\n")
+    chunks.append("*Node\n")
+    node_ids = np.arange(1, len(coords) + 1)
+    chunks.append(_format_rows(np.column_stack([node_ids, coords]), "%d, %.3f, %.3f, %.3f"))
 
     # Element generation
-    output.write("*Element, type=C3D8\n")
-    elem_id = 1
-    
-    # Head elements
-    for layer in range(num_head_layers):
-        for i in range(num_circumferential):
-            for r in range(int(head_radius / element_size)):
-                n = [
-                    nodes[(layer, i, r)],
-                    nodes[(layer, i+1, r)],
-                    nodes[(layer, i+1, r+1)],
-                    nodes[(layer, i, r+1)],
-                    nodes[(layer+1, i, r)],
-                    nodes[(layer+1, i+1, r)],
-                    nodes[(layer+1, i+1, r+1)],
-                    nodes[(layer+1, i, r+1)]
-                ]
-                output.write(f"{elem_id}, " + ", ".join(map(str, n)) + "\n")
-                elem_id += 1
-
-    # Shank elements
-    for layer in range(num_shank_layers):
-        for i in range(num_circumferential):
-            for r in range(int(shank_radius / element_size)):
-                n = [
-                    nodes[('shank', layer, i, r)],
-                    nodes[('shank', layer, i+1, r)],
-                    nodes[('shank', layer, i+1, r+1)],
-                    nodes[('shank', layer, i, r+1)],
-                    nodes[('shank', layer+1, i, r)],
-                    nodes[('shank', layer+1, i+1, r)],
-                    nodes[('shank', layer+1, i+1, r+1)],
-                    nodes[('shank', layer+1, i, r+1)]
-                ]
-                output.write(f"{elem_id}, " + ", ".join(map(str, n)) + "\n")
-                elem_id += 1
+    chunks.append("*Element, type=C3D8\n")
+    elem_ids = np.arange(1, len(connectivity) + 1)
+    chunks.append(_format_rows(np.column_stack([elem_ids, connectivity]), "%d", delimiter=", "))
 
     # Complete INP file
-    output.write("*End Part\n")
-    output.write("*Material, name=Steel\n*Elastic\n210000, 0.3\n")
-    output.write("*Solid Section, elset=ALL_ELEMENTS, material=Steel\n")
-    output.write("*Assembly, name=Assembly\n*Instance, part=Bolt\n*End Instance\n*End Assembly\n")
-    output.write("*Step, name=StaticStep\n*Static\n1.0, 1.0\n*End Step")
-    
-    content = output.getvalue()
-    return content, io.BytesIO(content.encode()), node_coords
+    chunks.append("*End Part\n")
+    chunks.append("*Material, name=Steel\n*Elastic\n210000, 0.3\n")
+    chunks.append("*Solid Section, elset=ALL_ELEMENTS, material=Steel\n")
+    chunks.append("*Assembly, name=Assembly\n*Instance, part=Bolt\n*End Instance\n*End Assembly\n")
+    chunks.append("*Step, name=StaticStep\n*Static\n1.0, 1.0\n*End Step")
+
+    # Only the encoded bytes (and a float32 copy of the nodes for the preview) are
+    # kept and cached; the download and the INP preview both read from the bytes
+    return "".join(chunks).encode('ascii'), coords.astype(np.float32)
+
+# Upper bound on markers sent to the browser; finer meshes are sampled down to it
+MAX_PREVIEW_POINTS = 20000
+# Number of INP lines shown in the app
+PREVIEW_LINES = 200
 
-def visualize_bolt(node_coords):
+# Hashing the node array on every rerun would cost about as much as plotting it,
+# so the leading underscore keeps it out of the cache key and bolt_params (the
+# inputs that produced it) identifies the figure instead
+@st.cache_data(max_entries=8)
+def visualize_bolt(_node_coords, bolt_params):
     fig = go.Figure()
-    if node_coords:
-        x, y, z = zip(*node_coords)
+    # A list of (x, y, z) tuples is still accepted; the (N, 3) float32 array from
+    # generate_bolt_input passes through without a copy. float32 columns are
+    # serialized by Plotly as compact binary typed arrays
+    node_coords = np.asarray(_node_coords, dtype=np.float32)
+    if len(node_coords):
+        points = sample_nodes(node_coords, MAX_PREVIEW_POINTS)
+        x, y, z = points[:, 0], points[:, 1], points[:, 2]
         fig.add_trace(go.Scatter3d(
             x=x, y=y, z=z,
             mode='markers',
@@ -131,22 +90,27 @@ es = st.sidebar.number_input("Element Size (mm)", 0.5, 5.0, 2.0)
 
 if st.sidebar.button("Generate Model"):
     with st.spinner("Creating 3D Bolt..."):
-        inp_content, inp_file, nodes = generate_bolt_input(hd, ht, sd, sl, es)
+        inp_bytes, nodes = generate_bolt_input(hd, ht, sd, sl, es)
         
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("Abaqus Input File")
             st.download_button(
                 "Download INP File",
-                data=inp_file,
+                data=inp_bytes,
                 file_name="bolt_model.inp",
                 mime="text/plain"
             )
-            st.code(inp_content, language='python')
+            # Only the head of the file is rendered; the full text is in the download
+            lines = inp_bytes.split(b"\n", PREVIEW_LINES)
+            preview = b"\n".join(lines[:PREVIEW_LINES]).decode('ascii')
+            if len(lines) > PREVIEW_LINES:
+                preview += "\n... (truncated, download for full file)"
+            st.code(preview, language='python')
         
         with col2:
             st.subheader("3D Preview")
-            st.plotly_chart(visualize_bolt(nodes), use_container_width=True)
+            st.plotly_chart(visualize_bolt(nodes, (hd, ht, sd, sl, es)), use_container_width=True)
         
         st.success(f"Generated bolt with total length: {ht + sl:.1f}mm")
 else:
@@ -0,0 +1,185 @@
+# Mesh builders for the bolt generator. They live outside app.py because
+# Streamlit re-executes the script on every rerun, while an imported module is
+# loaded once and lets Numba reuse its on-disk cache.
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; without it the mesh is built with plain NumPy
+    njit = None
+
+def mesh_tables(head_diameter, head_thickness, shank_diameter, shank_length, element_size):
+    head_radius = head_diameter / 2
+    shank_radius = shank_diameter / 2
+    
+    num_circumferential = max(8, int((np.pi * max(head_diameter, shank_diameter)) / element_size))
+    num_head_layers = max(1, int(head_thickness / element_size))
+    num_shank_layers = max(1, int(shank_length / element_size))
+    
+    num_head_radial = int(head_radius / element_size) + 1
+    num_shank_radial = int(shank_radius / element_size) + 1
+
+    # Each table depends on a single grid index, so it is computed once here
+    # rather than per node
+    theta = (np.arange(num_circumferential + 1) / num_circumferential) * 2 * np.pi
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    # The ring count is floor(radius / element_size), so the clamp only trims
+    # floating-point overshoot on the outer ring. It runs once per table, so it is
+    # not worth special-casing radii that the element size divides evenly
+    head_radii = np.minimum(np.arange(num_head_radial) * element_size, head_radius)
+    shank_radii = np.minimum(np.arange(num_shank_radial) * element_size, shank_radius)
+    head_z = head_thickness - (np.arange(num_head_layers + 1) / num_head_layers) * head_thickness
+    # The shank hangs below the head. When every shank ring also exists in the head
+    # it shares the head's bottom layer at z = 0; a wider shank keeps its own
+    shank_z = -(np.arange(num_shank_layers + 1) * (shank_length / num_shank_layers))
+    if num_shank_radial <= num_head_radial:
+        shank_z = shank_z[1:]
+    return cos_t, sin_t, head_radii, shank_radii, head_z, shank_z
+
+def _build_mesh_numpy(cos_t, sin_t, head_radii, shank_radii, head_z, shank_z):
+    # If the shank is no wider than the head, shank_z leaves out its top layer,
+    # which is then the head's bottom layer (see mesh_tables)
+    num_circumferential = len(cos_t) - 1
+    num_head_radial, num_shank_radial = len(head_radii), len(shank_radii)
+    shared = num_shank_radial <= num_head_radial
+    num_head_layers = len(head_z) - 1
+    num_shank_layers = len(shank_z) if shared else len(shank_z) - 1
+
+    # Node IDs are laid out block by block in (layer, i, r) order, so they can be
+    # computed directly instead of being looked up
+    num_ring = num_circumferential + 1
+    num_head_nodes = (num_head_layers + 1) * num_ring * num_head_radial
+    num_shank_nodes = len(shank_z) * num_ring * num_shank_radial
+    shank_base = 1 + num_head_nodes
+    first_shank_layer = 1 if shared else 0
+
+    def head_id(layer, i, r):
+        return 1 + (layer * num_ring + i) * num_head_radial + r
+
+    def shank_id(layer, i, r):
+        own = shank_base + ((layer - first_shank_layer) * num_ring + i) * num_shank_radial + r
+        if shared:
+            return np.where(layer == 0, head_id(num_head_layers, i, r), own)
+        return own
+
+    coords = np.empty((num_head_nodes + num_shank_nodes, 3), dtype=cos_t.dtype)
+
+    def fill_nodes(block, radii, z_layers):
+        block = block.reshape(len(z_layers), num_ring, len(radii), 3)
+        block[..., 0] = cos_t[:, None] * radii
+        block[..., 1] = sin_t[:, None] * radii
+        block[..., 2] = z_layers[:, None, None]
+
+    # Bolt head generation
+    fill_nodes(coords[:num_head_nodes], head_radii, head_z)
+
+    # Corrected shank generation
+    fill_nodes(coords[num_head_nodes:], shank_radii, shank_z)
+
+    def hex_elements(node_id, num_layers, num_radial):
+        L, I, R = np.meshgrid(np.arange(num_layers), np.arange(num_circumferential),
+                              np.arange(num_radial - 1), indexing='ij')
+        return np.stack([
+            node_id(L, I, R),
+            node_id(L, I + 1, R),
+            node_id(L, I + 1, R + 1),
+            node_id(L, I, R + 1),
+            node_id(L + 1, I, R),
+            node_id(L + 1, I + 1, R),
+            node_id(L + 1, I + 1, R + 1),
+            node_id(L + 1, I, R + 1)
+        ], axis=-1).reshape(-1, 8)
+
+    # Head elements followed by shank elements
+    connectivity = np.vstack([
+        hex_elements(head_id, num_head_layers, num_head_radial),
+        hex_elements(shank_id, num_shank_layers, num_shank_radial)
+    ])
+    return coords, connectivity
+
+def _build_mesh_loops(cos_t, sin_t, head_radii, shank_radii, head_z, shank_z):
+    # Same mesh as _build_mesh_numpy, written as explicit loops for Numba to compile
+    num_circumferential = len(cos_t) - 1
+    num_head_radial, num_shank_radial = len(head_radii), len(shank_radii)
+    shared = num_shank_radial <= num_head_radial
+    num_head_layers = len(head_z) - 1
+    num_shank_layers = len(shank_z) if shared else len(shank_z) - 1
+    first_shank_layer = 1 if shared else 0
+    num_ring = num_circumferential + 1
+    num_head_nodes = (num_head_layers + 1) * num_ring * num_head_radial
+    num_shank_nodes = len(shank_z) * num_ring * num_shank_radial
+    num_head_elements = num_head_layers * num_circumferential * (num_head_radial - 1)
+    num_shank_elements = num_shank_layers * num_circumferential * (num_shank_radial - 1)
+    coords = np.empty((num_head_nodes + num_shank_nodes, 3), dtype=cos_t.dtype)
+    connectivity = np.empty((num_head_elements + num_shank_elements, 8), dtype=np.int64)
+
+    # Bolt head generation
+    n = 0
+    for layer in range(num_head_layers + 1):
+        for i in range(num_ring):
+            for r in range(num_head_radial):
+                coords[n, 0] = head_radii[r] * cos_t[i]
+                coords[n, 1] = head_radii[r] * sin_t[i]
+                coords[n, 2] = head_z[layer]
+                n += 1
+
+    # Corrected shank generation
+    for layer in range(len(shank_z)):
+        for i in range(num_ring):
+            for r in range(num_shank_radial):
+                coords[n, 0] = shank_radii[r] * cos_t[i]
+                coords[n, 1] = shank_radii[r] * sin_t[i]
+                coords[n, 2] = shank_z[layer]
+                n += 1
+
+    # Head elements followed by shank elements. Each element layer spans a top and
+    # a bottom node layer, addressed as first ID + i * stride + r
+    e = 0
+    for layer in range(num_head_layers + num_shank_layers):
+        if layer < num_head_layers:
+            top = 1 + layer * num_ring * num_head_radial
+            top_stride = num_head_radial
+            bottom = top + num_ring * num_head_radial
+            bottom_stride = num_head_radial
+            num_cells = num_head_radial - 1
+        else:
+            shank_layer = layer - num_head_layers
+            if shared and shank_layer == 0:
+                top = 1 + num_head_layers * num_ring * num_head_radial
+                top_stride = num_head_radial
+            else:
+                top = 1 + num_head_nodes + (shank_layer - first_shank_layer) * num_ring * num_shank_radial
+                top_stride = num_shank_radial
+            bottom = 1 + num_head_nodes + (shank_layer + 1 - first_shank_layer) * num_ring * num_shank_radial
+            bottom_stride = num_shank_radial
+            num_cells = num_shank_radial - 1
+        for i in range(num_circumferential):
+            for r in range(num_cells):
+                n1 = top + i * top_stride + r
+                n2 = n1 + top_stride
+                n5 = bottom + i * bottom_stride + r
+                n6 = n5 + bottom_stride
+                connectivity[e, 0] = n1
+                connectivity[e, 1] = n2
+                connectivity[e, 2] = n2 + 1
+                connectivity[e, 3] = n1 + 1
+                connectivity[e, 4] = n5
+                connectivity[e, 5] = n6
+                connectivity[e, 6] = n6 + 1
+                connectivity[e, 7] = n5 + 1
+                e += 1
+    return coords, connectivity
+
+if njit is not None:
+    build_mesh = njit(cache=True)(_build_mesh_loops)
+else:
+    build_mesh = _build_mesh_numpy
+
+def sample_nodes(node_coords, max_points):
+    # A fixed stride lines up with the (layer, i, r) node order and can land on a
+    # single ring, so a seeded random subset is taken instead; sorting keeps the
+    # nodes in mesh order
+    if len(node_coords) <= max_points:
+        return node_coords
+    picks = np.random.default_rng(0).choice(len(node_coords), max_points, replace=False)
+    return node_coords[np.sort(picks)]
@@ -0,0 +1 @@
+# Keeps the repository root importable so the tests can import bolt_mesh
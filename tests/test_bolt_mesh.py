@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from bolt_mesh import _build_mesh_loops, _build_mesh_numpy, mesh_tables, sample_nodes
+
+# (head_diameter, head_thickness, shank_diameter, shank_length, element_size)
+PARAMS = [
+    (20.0, 8.0, 12.0, 40.0, 2.0),   # UI defaults, radii divide evenly
+    (17.0, 5.0, 9.0, 33.0, 1.7),    # radii not divisible by the element size
+    (20.0, 8.0, 5.0, 10.0, 0.7),
+    (10.0, 2.0, 5.0, 10.0, 5.0),    # coarsest mesh, no shank cells
+    (10.0, 4.0, 24.0, 20.0, 2.0),   # shank wider than the head
+]
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_loop_builder_matches_numpy_builder(params):
+    # The loop builder only runs when Numba is installed; here it runs as plain
+    # Python so the two paths are checked on every install
+    tables = mesh_tables(*params)
+    coords, connectivity = _build_mesh_numpy(*tables)
+    loop_coords, loop_connectivity = _build_mesh_loops(*tables)
+    assert np.array_equal(coords, loop_coords)
+    assert np.array_equal(connectivity, loop_connectivity)
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_connectivity_references_existing_nodes(params):
+    coords, connectivity = _build_mesh_numpy(*mesh_tables(*params))
+    assert connectivity.min() >= 1
+    assert connectivity.max() <= len(coords)
+
+
+def _num_head_nodes(tables):
+    cos_t, _, head_radii, _, head_z, _ = tables
+    return len(head_z) * len(cos_t) * len(head_radii)
+
+
+def test_narrow_shank_hangs_from_head_bottom_layer():
+    tables = mesh_tables(20.0, 8.0, 12.0, 40.0, 2.0)
+    coords, connectivity = _build_mesh_numpy(*tables)
+    num_head_nodes = _num_head_nodes(tables)
+    # No shank node duplicates the interface, and some shank elements use head nodes
+    assert not (coords[num_head_nodes:, 2] == 0).any()
+    crossing = (connectivity <= num_head_nodes).any(axis=1) & (connectivity > num_head_nodes).any(axis=1)
+    assert crossing.any()
+
+
+def test_wide_shank_keeps_its_own_top_layer():
+    tables = mesh_tables(10.0, 4.0, 24.0, 20.0, 2.0)
+    coords, connectivity = _build_mesh_numpy(*tables)
+    num_head_nodes = _num_head_nodes(tables)
+    assert (coords[num_head_nodes:, 2] == 0).any()
+    crossing = (connectivity <= num_head_nodes).any(axis=1) & (connectivity > num_head_nodes).any(axis=1)
+    assert not crossing.any()
+
+
+@pytest.mark.parametrize("params", [(30.0, 2.0, 30.0, 100.0, 0.7), (50.0, 20.0, 12.0, 40.0, 0.7)])
+def test_sampled_preview_covers_radii_and_angles(params):
+    # A fixed stride over these meshes plotted only the axis or a few rings
+    coords, _ = _build_mesh_numpy(*mesh_tables(*params))
+    points = sample_nodes(coords, 20000)
+    assert len(points) == 20000
+    radii = np.unique(np.round(np.hypot(points[:, 0], points[:, 1]), 3))
+    angles = np.unique(np.round(np.arctan2(points[:, 1], points[:, 0]), 3))
+    all_radii = np.unique(np.round(np.hypot(coords[:, 0], coords[:, 1]), 3))
+    assert len(radii) == len(all_radii)
+    assert len(angles) > 100